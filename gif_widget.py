@@ -1,15 +1,1067 @@
 #!/usr/bin/env python3
 import tkinter as tk
 from tkinter import filedialog, messagebox
-from PIL import Image, ImageTk, ImageGrab
+from PIL import Image, ImageTk, ImageGrab, ImageChops, ImageStat
 import subprocess
 import json
 import os
-import threading
+import sys
 import time
-from collections import Counter
+import threading
+import asyncio
+import queue
+import heapq
+import hashlib
+import multiprocessing
+import ctypes
+import ctypes.util
+import struct
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from collections import Counter, OrderedDict
 import colorsys
 
+def get_quality_filter():
+    """Return the LANCZOS resampling filter for the installed PIL version"""
+    try:
+        # For new PIL versions
+        return Image.Resampling.LANCZOS
+    except AttributeError:
+        try:
+            # For old PIL versions
+            return Image.LANCZOS
+        except AttributeError:
+            # For very old versions
+            return 1  # LANCZOS numeric value
+
+def scaled_resize(image, size, resample=None, reducing_gap=3.0):
+    """Resize image, pre-reducing by an integer factor when downscaling a lot
+    
+    PIL's reducing_gap does a cheap box reduction while the intermediate is
+    still at least reducing_gap times the target size, so the quality filter
+    only runs on a small image and the output stays visually the same.
+    """
+    if resample is None:
+        resample = get_quality_filter()
+    
+    # PIL falls back to NEAREST for palette images, convert so every frame gets the same filter
+    if image.mode in ('1', 'P'):
+        image = image.convert('RGBA')
+    
+    try:
+        # PIL ignores reducing_gap for RGBA, so do its premultiplied-alpha step here
+        if image.mode == 'RGBA':
+            return image.convert('RGBa').resize(size, resample, reducing_gap=reducing_gap).convert('RGBA')
+        return image.resize(size, resample, reducing_gap=reducing_gap)
+    except TypeError:
+        # PIL older than 7.0 has no reducing_gap
+        return image.resize(size, resample)
+
+def iter_gif_frames(gif, size):
+    """Yield every frame of an open GIF scaled to size"""
+    frame_count = 0
+    try:
+        while True:
+            yield scaled_resize(gif, size)
+            frame_count += 1
+            gif.seek(frame_count)
+    except EOFError:
+        pass
+
+def changed_rects(previous, frame, tile_size=32):
+    """Rectangles that differ between two RGBA frames of the same size"""
+    # Largest per-pixel change over all channels, alpha included
+    bands = ImageChops.difference(previous, frame).split()
+    changes = bands[0]
+    for band in bands[1:]:
+        changes = ImageChops.lighter(changes, band)
+    
+    # Changes are tracked per tile, then merged along tile rows
+    width, height = frame.size
+    rects = []
+    for top in range(0, height, tile_size):
+        bottom = min(top + tile_size, height)
+        run = None
+        for left in range(0, width, tile_size):
+            right = min(left + tile_size, width)
+            if changes.crop((left, top, right, bottom)).getbbox():
+                if run:
+                    run[2] = right
+                else:
+                    run = [left, top, right, bottom]
+            elif run:
+                rects.append(tuple(run))
+                run = None
+        if run:
+            rects.append(tuple(run))
+    return rects
+
+class DeltaFrames:
+    """Key frame plus the changed patches of every frame, the compact form DeltaPresenter uses"""
+
+    full_frame_ratio = 0.5  # Store the whole frame when more than this share changed
+
+    def __init__(self, frames, tile_size=32):
+        frames = [frame.convert('RGBA') for frame in frames]
+        self.size = frames[0].size if frames else (0, 0)
+        self.key = frames[0] if frames else None
+        # Frame 0 is diffed against the last frame so looping stays incremental
+        self.patches = [self.frame_patches(frames[index - 1], frame, tile_size)
+                        for index, frame in enumerate(frames)]
+
+    def __len__(self):
+        return len(self.patches)
+
+    def frame_patches(self, previous, frame, tile_size):
+        """(image, x, y) writes that turn previous into frame"""
+        rects = changed_rects(previous, frame, tile_size)
+        width, height = frame.size
+        changed_area = sum((right - left) * (bottom - top) for left, top, right, bottom in rects)
+        if changed_area > width * height * self.full_frame_ratio:
+            return [(frame, 0, 0)]
+        return [(frame.crop(rect), rect[0], rect[1]) for rect in rects]
+
+    def nbytes(self):
+        """Approximate memory held by the key frame and patches"""
+        total = self.size[0] * self.size[1] * 4
+        for patches in self.patches:
+            total += sum(image.width * image.height * 4 for image, _, _ in patches)
+        return total
+
+class FrameSource:
+    """Decode and scale GIF frames, caching recent results"""
+
+    def __init__(self, cache_bytes=64 * 1024 * 1024):
+        self.cache = OrderedDict()  # (path, mtime, size, delta) -> (frames, bytes)
+        self.cache_bytes = cache_bytes
+        self.lock = threading.Lock()  # Frames are also decoded on the service loop
+
+    def frames(self, path, size, delta=False):
+        """Return the scaled frames of a GIF file, as DeltaFrames if delta is set"""
+        key = (path, os.path.getmtime(path), tuple(size), delta)
+        with self.lock:
+            if key in self.cache:
+                self.cache.move_to_end(key)
+                return self.cache[key][0]
+        
+        with Image.open(path) as gif:
+            frames = list(iter_gif_frames(gif, size))
+        
+        # Delta mode keeps only the key frame and changed patches, not every full frame
+        if delta and frames:
+            frames = DeltaFrames(frames)
+            cost = frames.nbytes()
+        else:
+            cost = size[0] * size[1] * 4 * len(frames)
+        
+        # Only keep what fits in the byte budget, oldest entries go first
+        if len(frames) and cost <= self.cache_bytes:
+            with self.lock:
+                self.cache[key] = (frames, cost)
+                while self.cached_bytes() > self.cache_bytes:
+                    self.cache.popitem(last=False)
+        return frames
+
+    def cached_bytes(self):
+        """Approximate memory held by cached frames"""
+        return sum(cost for _, cost in self.cache.values())
+
+class Presenter:
+    """Interface between the playback clock and whatever shows the frames"""
+
+    wants_deltas = False  # Takes DeltaFrames from FrameSource instead of a frame list
+
+    def load(self, frames):
+        """Convert scaled frames into per-frame handles"""
+        raise NotImplementedError
+
+    def show(self, handle):
+        """Display a frame handle"""
+        raise NotImplementedError
+
+class OffscreenPresenter(Presenter):
+    """Record which frame would be shown when, without any display"""
+
+    def __init__(self, now):
+        self.now = now  # Callable returning the current time in ms
+        self.shown = []  # (time, frame index) pairs
+
+    def load(self, frames):
+        """Use frame indices as handles"""
+        return list(range(len(list(frames))))
+
+    def show(self, handle):
+        """Record the frame and the time it would appear"""
+        self.shown.append((self.now(), handle))
+
+class SimulatedScheduler:
+    """Tk-style after()/after_cancel() on a virtual millisecond clock"""
+
+    def __init__(self):
+        self.now = 0
+        self.jobs = []  # Heap of (due time, job id, callback, args)
+        self.cancelled = set()
+        self.next_job = 0
+
+    def time(self):
+        """Current virtual time in ms"""
+        return self.now
+
+    def after(self, ms, callback, *args):
+        """Schedule callback ms milliseconds from now"""
+        self.next_job += 1
+        heapq.heappush(self.jobs, (self.now + ms, self.next_job, callback, args))
+        return self.next_job
+
+    def after_cancel(self, job):
+        """Cancel a scheduled callback"""
+        self.cancelled.add(job)
+
+    def run_for(self, ms):
+        """Run every callback due in the next ms milliseconds"""
+        end = self.now + ms
+        while self.jobs and self.jobs[0][0] <= end:
+            due, job, callback, args = heapq.heappop(self.jobs)
+            if job in self.cancelled:
+                self.cancelled.discard(job)
+                continue
+            self.now = due
+            callback(*args)
+        self.now = end
+
+class PlaybackClock:
+    """Step through frame handles on a scheduler with after()/after_cancel()"""
+
+    def __init__(self, scheduler, presenter, frame_delay=100):
+        self.scheduler = scheduler  # Tk root or SimulatedScheduler
+        self.presenter = presenter
+        self.frame_delay = frame_delay  # ms
+        self.frames = []
+        self.next_frames = None  # Swapped in at the next frame boundary
+        self.current_frame = 0
+        self.job = None
+
+    @property
+    def is_playing(self):
+        """True while a tick is scheduled"""
+        return self.job is not None
+
+    def set_frames(self, frames):
+        """Replace frame handles and restart from the first frame"""
+        self.frames = frames
+        self.next_frames = None
+        self.current_frame = 0
+
+    def queue_frames(self, frames):
+        """Replace frame handles at the next frame boundary"""
+        if self.is_playing:
+            self.next_frames = frames
+        else:
+            self.set_frames(frames)
+
+    def start(self):
+        """Start playback (no-op if already playing)"""
+        if self.job is None and self.frames:
+            self.tick()
+
+    def stop(self):
+        """Stop playback"""
+        if self.job is not None:
+            self.scheduler.after_cancel(self.job)
+            self.job = None
+
+    def tick(self):
+        """Show the current frame and schedule the next one"""
+        self.job = None
+        if self.next_frames is not None:
+            self.set_frames(self.next_frames)
+        if not self.frames:
+            return
+        
+        # Make sure frame index is valid
+        if self.current_frame >= len(self.frames):
+            self.current_frame = 0
+        
+        try:
+            self.presenter.show(self.frames[self.current_frame])
+            self.current_frame = (self.current_frame + 1) % len(self.frames)
+        except Exception as e:
+            # In case of index error or TCL error, go to beginning
+            print(f"Animation error: {e}")
+            self.current_frame = 0
+            try:
+                self.presenter.show(self.frames[0])
+            except Exception:
+                # If still error, stop animation
+                return
+        
+        self.job = self.scheduler.after(self.frame_delay, self.tick)
+
+class LabelPresenter(Presenter):
+    """Show each frame as its own PhotoImage on a Label"""
+
+    def __init__(self):
+        self.widget = None
+
+    def create_widget(self, parent):
+        """Create the display widget"""
+        self.widget = tk.Label(parent, bg='black', bd=0, highlightthickness=0)
+        return self.widget
+
+    def load(self, frames):
+        """Convert scaled frames into per-frame handles"""
+        return [ImageTk.PhotoImage(frame) for frame in frames]
+
+    def show(self, handle):
+        """Display a frame handle"""
+        self.widget.config(image=handle)
+
+class AtlasPresenter(Presenter):
+    """Pack frames into a few atlas PhotoImages shown through a Canvas viewport"""
+
+    max_atlas_size = 4096  # Atlas edge limit in pixels
+
+    def __init__(self):
+        self.widget = None
+        self.item = None
+        self.current_atlas = None
+
+    def create_widget(self, parent):
+        """Create the display widget"""
+        self.widget = tk.Canvas(parent, bg='black', bd=0, highlightthickness=0, width=1, height=1)
+        self.item = self.widget.create_image(0, 0, anchor='nw')
+        self.current_atlas = None
+        return self.widget
+
+    def load(self, frames):
+        """Pack scaled frames into atlases, returning (atlas, x, y) handles"""
+        frames = list(frames)
+        if not frames:
+            return []
+        
+        width, height = frames[0].size
+        columns = max(1, min(len(frames), self.max_atlas_size // width))
+        rows = max(1, self.max_atlas_size // height)
+        per_atlas = columns * rows
+        
+        handles = []
+        for first in range(0, len(frames), per_atlas):
+            chunk = frames[first:first + per_atlas]
+            used_rows = (len(chunk) + columns - 1) // columns
+            sheet = Image.new('RGBA', (columns * width, used_rows * height))
+            slots = []
+            for slot, frame in enumerate(chunk):
+                x = (slot % columns) * width
+                y = (slot // columns) * height
+                sheet.paste(frame, (x, y))
+                slots.append((x, y))
+            atlas = ImageTk.PhotoImage(sheet)
+            handles.extend((atlas, x, y) for x, y in slots)
+        
+        # Viewport shows exactly one frame
+        self.widget.config(width=width, height=height)
+        return handles
+
+    def show(self, handle):
+        """Display a frame handle by moving the atlas under the viewport"""
+        atlas, x, y = handle
+        if atlas is not self.current_atlas:
+            self.widget.itemconfig(self.item, image=atlas)
+            self.current_atlas = atlas
+        self.widget.coords(self.item, -x, -y)
+
+class DeltaPresenter(Presenter):
+    """Keep one PhotoImage on a Label and write only the changed rectangles each tick"""
+
+    wants_deltas = True
+
+    def __init__(self):
+        self.widget = None
+        self.target = None  # The persistent PhotoImage on screen
+        self.shown = None  # (sequence, index) currently in target
+
+    def create_widget(self, parent):
+        """Create the display widget"""
+        self.widget = tk.Label(parent, bg='black', bd=0, highlightthickness=0)
+        self.target = None
+        self.shown = None
+        return self.widget
+
+    def load(self, frames):
+        """Turn precomputed patches into PhotoImages, returning (sequence, index) handles"""
+        # Rectangles normally come precomputed from FrameSource, plain frame lists are diffed here
+        if not isinstance(frames, DeltaFrames):
+            frames = DeltaFrames(frames)
+        if not len(frames):
+            return []
+        
+        key = ImageTk.PhotoImage(frames.key)
+        patches = [[(ImageTk.PhotoImage(image), x, y) for image, x, y in frame_patches]
+                   for frame_patches in frames.patches]
+        sequence = (key, patches, frames.size)
+        return [(sequence, index) for index in range(len(patches))]
+
+    def write(self, patches):
+        """Copy patches into the on-screen image"""
+        for photo, x, y in patches:
+            self.target.tk.call(self.target.name, 'copy', str(photo),
+                                '-to', x, y, '-compositingrule', 'set')
+
+    def show(self, handle):
+        """Advance the on-screen image to a frame handle"""
+        sequence, index = handle
+        key, patches, size = sequence
+        if self.shown is not None and self.shown[0] is sequence:
+            if self.shown[1] == index:
+                return
+            if (self.shown[1] + 1) % len(patches) == index:
+                self.write(patches[index])
+                self.shown = handle
+                return
+        
+        # New GIF or a jump: rebuild from the key frame
+        if self.target is None or (self.target.width(), self.target.height()) != size:
+            self.target = tk.PhotoImage(master=self.widget, width=size[0], height=size[1])
+            self.widget.config(image=self.target)
+        self.write([(key, 0, 0)])
+        for step in range(1, index + 1):
+            self.write(patches[step])
+        self.shown = handle
+
+PRESENTERS = {
+    'label': LabelPresenter,
+    'atlas': AtlasPresenter,
+    'delta': DeltaPresenter
+}
+
+THUMBNAIL_DIR = os.path.expanduser("~/.cache/gif_widget/thumbnails")
+
+def make_thumbnail(path, thumb_path, size, max_frames):
+    """Render the first frames of a GIF into a horizontal PNG strip (runs in a worker process)"""
+    try:
+        mtime = os.path.getmtime(path)
+        frames = []
+        with Image.open(path) as gif:
+            for frame in iter_gif_frames(gif, (size, size)):
+                frames.append(frame)
+                if len(frames) >= max_frames:
+                    break
+        if not frames:
+            return None
+        
+        strip = Image.new('RGBA', (size * len(frames), size))
+        for index, frame in enumerate(frames):
+            strip.paste(frame, (index * size, 0))
+        
+        # Write under a temporary name so a half-written strip is never indexed
+        os.makedirs(os.path.dirname(thumb_path), exist_ok=True)
+        temp_path = thumb_path + '.tmp'
+        strip.save(temp_path, 'PNG')
+        os.replace(temp_path, thumb_path)
+        return path, mtime, len(frames)
+    except Exception as e:
+        print(f"Thumbnail error ({path}): {e}")
+        return None
+
+class ThumbnailIndex:
+    """Persistent index of thumbnail strips keyed by GIF path and mtime"""
+
+    def __init__(self, directory=THUMBNAIL_DIR):
+        self.directory = directory
+        self.index_file = os.path.join(directory, 'index.json')
+        self.entries = {}  # path -> {'mtime': float, 'frames': int}
+        self.photos = {}  # (path, mtime) -> PhotoImage, reused while the widget runs
+        self.load()
+
+    def load(self):
+        """Load the index from disk"""
+        try:
+            if os.path.exists(self.index_file):
+                with open(self.index_file, 'r') as f:
+                    self.entries = json.load(f)
+        except Exception as e:
+            print(f"Thumbnail index loading error: {e}")
+            self.entries = {}
+
+    def save(self):
+        """Save the index to disk"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            temp_file = self.index_file + '.tmp'
+            with open(temp_file, 'w') as f:
+                json.dump(self.entries, f)
+            os.replace(temp_file, self.index_file)
+        except Exception as e:
+            print(f"Thumbnail index saving error: {e}")
+
+    def thumb_path(self, path):
+        """Strip file for a GIF path"""
+        digest = hashlib.sha1(path.encode('utf-8', 'surrogateescape')).hexdigest()
+        return os.path.join(self.directory, digest + '.png')
+
+    def lookup(self, path, mtime):
+        """Return the frame count of a valid cached strip, or None"""
+        entry = self.entries.get(path)
+        if entry and entry['mtime'] == mtime and os.path.exists(self.thumb_path(path)):
+            return entry['frames']
+        return None
+
+    def store(self, path, mtime, frames):
+        """Record a freshly generated strip"""
+        self.entries[path] = {'mtime': mtime, 'frames': frames}
+
+class GifGallery:
+    """Thumbnail picker for the GIFs in a folder"""
+
+    columns = 5
+    thumb_size = 96
+    thumb_frames = 8  # Only the first frames are decoded for previews
+    preview_delay = 120  # ms between preview frames
+    tile_batch = 20  # Tiles created per event loop turn, keeps the window responsive
+    max_workers = min(4, os.cpu_count() or 1)
+
+    def __init__(self, root, directory, index):
+        self.root = root
+        self.directory = directory
+        self.index = index
+        self.result = None
+        self.tiles = []  # [canvas, image item, frame count] per animated tile
+        self.pending = {}  # future -> (canvas, item)
+        self.pool = None
+        self.preview_frame = 0
+        self.closed = False
+        self.scan_id = 0  # Bumped per scan so stale tile batches stop
+        self.scan_entries = []  # (path, mtime) of the GIFs in the folder
+        
+        self.window = tk.Toplevel(root)
+        self.window.title("Select GIF")
+        self.window.geometry("620x520")
+        self.window.protocol('WM_DELETE_WINDOW', self.close)
+        
+        # Top bar
+        bar = tk.Frame(self.window)
+        bar.pack(fill='x')
+        tk.Button(bar, text="Open Folder...", command=self.choose_folder).pack(side='left')
+        tk.Button(bar, text="Other File...", command=self.choose_file).pack(side='left')
+        tk.Button(bar, text="Cancel", command=self.close).pack(side='right')
+        self.folder_label = tk.Label(bar, anchor='w')
+        self.folder_label.pack(side='left', fill='x', expand=True)
+        
+        # Scrollable thumbnail grid
+        self.canvas = tk.Canvas(self.window, highlightthickness=0)
+        scrollbar = tk.Scrollbar(self.window, orient='vertical', command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        self.canvas.pack(side='left', fill='both', expand=True)
+        self.grid = tk.Frame(self.canvas)
+        self.canvas.create_window(0, 0, window=self.grid, anchor='nw')
+        self.grid.bind('<Configure>', lambda e: self.canvas.configure(scrollregion=self.canvas.bbox('all')))
+        self.window.bind('<Button-4>', lambda e: self.canvas.yview_scroll(-1, 'units'))
+        self.window.bind('<Button-5>', lambda e: self.canvas.yview_scroll(1, 'units'))
+        
+        self.scan()
+        self.window.after(self.preview_delay, self.animate_previews)
+        self.window.after(100, self.poll_workers)
+
+    def show(self):
+        """Run the picker modally and return the chosen path (or None)"""
+        self.window.wait_visibility()
+        self.window.grab_set()
+        self.window.wait_window()
+        return self.result
+
+    def scan(self):
+        """Build tiles for every GIF in the current folder"""
+        self.cancel_workers()
+        for child in self.grid.winfo_children():
+            child.destroy()
+        self.tiles = []
+        self.canvas.yview_moveto(0)
+        self.folder_label.config(text=self.directory)
+        
+        try:
+            entries = sorted(
+                (entry for entry in os.scandir(self.directory)
+                 if entry.is_file() and entry.name.lower().endswith('.gif')),
+                key=lambda entry: entry.name.lower()
+            )
+        except OSError as e:
+            print(f"Folder scan error: {e}")
+            entries = []
+        
+        # Tiles are built in batches so the window shows up right away
+        self.scan_id += 1
+        self.scan_entries = [(entry.path, entry.stat().st_mtime) for entry in entries]
+        self.window.after_idle(self.add_tile_batch, self.scan_id, 0)
+
+    def add_tile_batch(self, scan_id, first):
+        """Create the next batch of tiles"""
+        if self.closed or scan_id != self.scan_id:
+            return
+        
+        last = min(first + self.tile_batch, len(self.scan_entries))
+        for position in range(first, last):
+            path, mtime = self.scan_entries[position]
+            self.add_tile(position, path, mtime)
+        
+        if last < len(self.scan_entries):
+            self.window.after(1, self.add_tile_batch, scan_id, last)
+        else:
+            self.index.save()
+
+    def add_tile(self, position, path, mtime):
+        """Create one thumbnail tile, loading or generating its strip"""
+        size = self.thumb_size
+        tile = tk.Frame(self.grid, padx=4, pady=4)
+        tile.grid(row=position // self.columns, column=position % self.columns)
+        canvas = tk.Canvas(tile, width=size, height=size, bg='black', highlightthickness=0)
+        canvas.pack()
+        name = os.path.basename(path)
+        label = tk.Label(tile, text=name if len(name) <= 14 else name[:13] + "…", font=('Arial', 8))
+        label.pack()
+        item = canvas.create_image(0, 0, anchor='nw')
+        
+        for widget in (canvas, label):
+            widget.bind('<Button-1>', lambda e, p=path: self.choose(p))
+        
+        frames = self.index.lookup(path, mtime)
+        if frames is not None:
+            self.set_thumbnail(canvas, item, path, mtime, frames)
+        else:
+            # Generate missing strips in parallel worker processes
+            if self.pool is None:
+                self.pool = self.create_pool()
+            try:
+                future = self.pool.submit(make_thumbnail, path, self.index.thumb_path(path),
+                                          size, self.thumb_frames)
+            except BrokenProcessPool as e:
+                print(f"Thumbnail error: {e}")
+                return
+            self.pending[future] = (canvas, item)
+
+    def create_pool(self):
+        """Worker pool that never forks the Tk process and its threads"""
+        try:
+            context = multiprocessing.get_context('forkserver')
+        except ValueError:
+            # No forkserver on this platform
+            context = multiprocessing.get_context('spawn')
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=context)
+
+    def set_thumbnail(self, canvas, item, path, mtime, frames):
+        """Show a strip on a tile and start animating it"""
+        photo = self.index.photos.get((path, mtime))
+        if photo is None:
+            try:
+                photo = tk.PhotoImage(master=self.window, file=self.index.thumb_path(path))
+            except tk.TclError as e:
+                print(f"Thumbnail loading error: {e}")
+                return
+            self.index.photos[(path, mtime)] = photo
+        canvas.itemconfig(item, image=photo)
+        self.tiles.append([canvas, item, frames])
+
+    def poll_workers(self):
+        """Pick up finished thumbnails on the Tk thread"""
+        if self.closed:
+            return
+        
+        done = [future for future in self.pending if future.done()]
+        for future in done:
+            canvas, item = self.pending.pop(future)
+            if future.cancelled():
+                continue
+            # A crashed or broken worker pool fails every pending future
+            if future.exception() is not None:
+                print(f"Thumbnail error: {future.exception()}")
+                continue
+            result = future.result()
+            if result:
+                path, mtime, frames = result
+                self.index.store(path, mtime, frames)
+                # Tile may be gone if the folder changed meanwhile
+                if canvas is not None:
+                    self.set_thumbnail(canvas, item, path, mtime, frames)
+        
+        if done and not self.pending:
+            self.index.save()
+        self.window.after(100, self.poll_workers)
+
+    def animate_previews(self):
+        """Advance every preview by one frame"""
+        if self.closed:
+            return
+        
+        self.preview_frame += 1
+        for canvas, item, frames in self.tiles:
+            canvas.coords(item, -(self.preview_frame % frames) * self.thumb_size, 0)
+        self.window.after(self.preview_delay, self.animate_previews)
+
+    def choose(self, path):
+        """Pick a GIF and close"""
+        self.result = path
+        self.close()
+
+    def choose_folder(self):
+        """Switch to another folder"""
+        directory = filedialog.askdirectory(parent=self.window, initialdir=self.directory)
+        if directory:
+            self.directory = directory
+            self.scan()
+
+    def choose_file(self):
+        """Fall back to the plain file dialog"""
+        file_path = filedialog.askopenfilename(
+            parent=self.window,
+            title="Select GIF file",
+            initialdir=self.directory,
+            filetypes=[("GIF files", "*.gif"), ("All files", "*.*")]
+        )
+        if file_path:
+            self.choose(file_path)
+
+    def cancel_workers(self):
+        """Drop thumbnails that have not started yet"""
+        # Running ones still finish and get indexed, but no longer have a tile
+        self.pending = {future: (None, None) for future in self.pending if not future.cancel()}
+
+    def close(self):
+        """Stop workers, save the index and close the window"""
+        self.closed = True
+        try:
+            self.cancel_workers()
+            if self.pool is not None:
+                self.pool.shutdown(wait=True)
+                self.pool = None
+            
+            # Index strips that finished while shutting down
+            for future in self.pending:
+                if future.cancelled():
+                    continue
+                if future.exception() is not None:
+                    print(f"Thumbnail error: {future.exception()}")
+                    continue
+                result = future.result()
+                if result:
+                    self.index.store(*result)
+            self.pending = {}
+            
+            self.index.save()
+        finally:
+            # Never leave the modal picker holding its grab
+            self.window.destroy()
+
+def file_signature(path):
+    """Return (mtime_ns, size) of a file, or None if it is missing"""
+    try:
+        stat = os.stat(path)
+    except (OSError, TypeError):
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+class Inotify:
+    """Minimal ctypes binding for Linux inotify"""
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+    EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, name length
+
+    def __init__(self):
+        self.libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        # AttributeError here means no inotify on this platform
+        self.fd = self.libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+    def add_watch(self, path, mask):
+        """Watch a path, returning the watch descriptor"""
+        wd = self.libc.inotify_add_watch(self.fd, os.fsencode(path), mask)
+        if wd < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {path}")
+        return wd
+
+    def remove_watch(self, wd):
+        """Stop watching a descriptor"""
+        self.libc.inotify_rm_watch(self.fd, wd)
+
+    def read_events(self):
+        """Return pending (wd, mask, name) events"""
+        try:
+            data = os.read(self.fd, 64 * 1024)
+        except BlockingIOError:
+            return []
+        
+        events = []
+        offset = 0
+        while offset + self.EVENT_HEADER.size <= len(data):
+            wd, mask, cookie, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = data[offset:offset + length].rstrip(b'\0')
+            offset += length
+            events.append((wd, mask, os.fsdecode(name)))
+        return events
+
+    def close(self):
+        """Release the inotify descriptor"""
+        os.close(self.fd)
+
+class BackgroundService:
+    """Run periodic background probes and file watches on a single asyncio loop thread"""
+
+    watch_mask = Inotify.IN_CLOSE_WRITE | Inotify.IN_MOVED_TO | Inotify.IN_CREATE
+
+    def __init__(self, max_pending=32, workers=2, debounce=0.3, poll_interval=2.0):
+        # Bounded result queue drained by the Tk thread
+        self.results = queue.Queue(maxsize=max_pending)
+        self.probes = {}
+        self.last_delivered = {}
+        self.wake_events = {}
+        self.workers = workers
+        self.loop = None
+        self.executor = None
+        self.thread = None
+        self.stopping = False
+        
+        # File watches: name -> path, changes are reported as (name, file signature)
+        self.watched = {}
+        self.debounce = debounce  # Seconds a burst of writes must settle
+        self.debounce_handles = {}
+        self.poll_interval = poll_interval  # Stat polling fallback without inotify
+        self.inotify = None
+        self.dir_watches = {}  # directory -> wd
+        self.stop_event = None
+
+    def add_probe(self, name, func, interval):
+        """Register a blocking probe function (call before start)"""
+        self.probes[name] = (func, interval)
+
+    def start(self):
+        """Start the service loop thread"""
+        if self.thread and self.thread.is_alive():
+            return
+        self.stopping = False
+        ready = threading.Event()
+        self.thread = threading.Thread(target=self._run_loop, args=(ready,), name="gif-widget-service")
+        self.thread.start()
+        ready.wait()
+
+    def _run_loop(self, ready):
+        """Service thread body"""
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+        # Probes block (subprocess, screenshot), so they run on a small owned pool
+        self.executor = ThreadPoolExecutor(max_workers=self.workers)
+        self.stop_event = asyncio.Event()
+        try:
+            tasks = []
+            for name, (func, interval) in self.probes.items():
+                self.wake_events[name] = asyncio.Event()
+                tasks.append(self.loop.create_task(self._probe_loop(name, func, interval)))
+            
+            # File watches use inotify when available, stat polling otherwise
+            try:
+                self.inotify = Inotify()
+                self.loop.add_reader(self.inotify.fd, self._on_inotify)
+            except (OSError, AttributeError) as e:
+                print(f"inotify unavailable, polling watched files: {e}")
+                self.inotify = None
+            for name in list(self.watched):
+                self._add_watch(name, self.watched[name])
+            if self.inotify is None:
+                tasks.append(self.loop.create_task(self._poll_watched()))
+            else:
+                tasks.append(self.loop.create_task(self.stop_event.wait()))
+            
+            ready.set()
+            self.loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        finally:
+            # Never leave start() waiting, even if setup failed
+            ready.set()
+            for handle in self.debounce_handles.values():
+                handle.cancel()
+            if self.inotify is not None:
+                self.loop.remove_reader(self.inotify.fd)
+                self.inotify.close()
+                self.inotify = None
+            self.dir_watches = {}
+            self.executor.shutdown(wait=True)
+            self.loop.close()
+
+    async def _probe_loop(self, name, func, interval):
+        """Run one probe every interval seconds or when triggered"""
+        wake = self.wake_events[name]
+        while not self.stopping:
+            try:
+                value = await self.loop.run_in_executor(self.executor, func)
+            except Exception as e:
+                print(f"Background probe error ({name}): {e}")
+                value = None
+            if self.stopping:
+                break
+            self._publish(name, value)
+            try:
+                await asyncio.wait_for(wake.wait(), interval)
+            except asyncio.TimeoutError:
+                pass
+            wake.clear()
+
+    def _add_watch(self, name, path):
+        """Start reporting changes to path, or stop if path is None (service thread)"""
+        if path:
+            self.watched[name] = path
+            # Current state is the baseline, only later changes are reported
+            self.last_delivered[name] = file_signature(path)
+        else:
+            self.watched.pop(name, None)
+        
+        if self.inotify is None:
+            return
+        # Watch the directory so atomic replaces (rename over the file) are seen too
+        directory = os.path.dirname(os.path.abspath(path)) if path else None
+        if directory and directory not in self.dir_watches:
+            try:
+                self.dir_watches[directory] = self.inotify.add_watch(directory, self.watch_mask)
+            except OSError as e:
+                print(f"File watch error: {e}")
+        
+        # Drop directory watches nobody needs any more
+        needed = {os.path.dirname(os.path.abspath(p)) for p in self.watched.values()}
+        for directory in list(self.dir_watches):
+            if directory not in needed:
+                self.inotify.remove_watch(self.dir_watches.pop(directory))
+
+    def _on_inotify(self):
+        """Debounce inotify events for watched files (service thread)"""
+        directories = {wd: directory for directory, wd in self.dir_watches.items()}
+        for wd, mask, file_name in self.inotify.read_events():
+            directory = directories.get(wd)
+            if directory is None:
+                continue
+            changed_path = os.path.join(directory, file_name)
+            for name, path in self.watched.items():
+                if os.path.abspath(path) == changed_path:
+                    self._schedule_check(name)
+
+    def _schedule_check(self, name):
+        """Report a watched file once writes have settled"""
+        handle = self.debounce_handles.pop(name, None)
+        if handle is not None:
+            handle.cancel()
+        self.debounce_handles[name] = self.loop.call_later(self.debounce, self._check_watched, name)
+
+    def _check_watched(self, name):
+        """Publish the signature of a watched file"""
+        self.debounce_handles.pop(name, None)
+        if name in self.watched:
+            self._publish(name, file_signature(self.watched[name]))
+
+    async def _poll_watched(self):
+        """Stat polling fallback for file watches"""
+        while not self.stopping:
+            for name in list(self.watched):
+                self._check_watched(name)
+            try:
+                await asyncio.wait_for(self.stop_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+    def watch(self, name, path):
+        """Report changes to path as (name, file signature) results (thread safe)"""
+        if self.thread is None or self.loop is None or self.loop.is_closed():
+            if path:
+                self.watched[name] = path
+            else:
+                self.watched.pop(name, None)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self._add_watch, name, path)
+        except RuntimeError:
+            pass
+
+    def submit(self, name, func):
+        """Run func on the service pool and always deliver (name, result) (thread safe)"""
+        def run():
+            future = self.loop.run_in_executor(self.executor, func)
+            future.add_done_callback(lambda f: self._deliver(name, f))
+        try:
+            self.loop.call_soon_threadsafe(run)
+        except (RuntimeError, AttributeError):
+            pass
+
+    def _deliver(self, name, future):
+        """Queue a one-off result, retrying while the queue is full"""
+        if self.stopping or future.cancelled():
+            return
+        if future.exception() is not None:
+            print(f"Background task error ({name}): {future.exception()}")
+            return
+        try:
+            self.results.put_nowait((name, future.result()))
+        except queue.Full:
+            self.loop.call_later(0.1, self._deliver, name, future)
+
+    def _publish(self, name, value):
+        """Queue a probe result if it differs from the last delivered one"""
+        if value is None:
+            # Probe skipped, make sure the next real result gets delivered
+            self.last_delivered.pop(name, None)
+            return
+        if name in self.last_delivered and self.last_delivered[name] == value:
+            return
+        try:
+            self.results.put_nowait((name, value))
+        except queue.Full:
+            # Tk side is behind, keep the old state so this result is retried next run
+            return
+        self.last_delivered[name] = value
+
+    def forget(self, name):
+        """Deliver the next result for name even if it matches the last one (thread safe)"""
+        if self.loop is None or self.loop.is_closed():
+            self.last_delivered.pop(name, None)
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.last_delivered.pop, name, None)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    def trigger(self, name):
+        """Run a probe as soon as possible (thread safe)"""
+        if not self.thread or self.stopping or name not in self.wake_events:
+            return
+        try:
+            self.loop.call_soon_threadsafe(self.wake_events[name].set)
+        except RuntimeError:
+            # Loop already closed
+            pass
+
+    def drain(self, limit=16):
+        """Return up to limit pending (name, value) results"""
+        items = []
+        while len(items) < limit:
+            try:
+                items.append(self.results.get_nowait())
+            except queue.Empty:
+                break
+        return items
+
+    def stop(self):
+        """Stop all probes and join the service thread"""
+        if not self.thread:
+            return
+        self.stopping = True
+        try:
+            for event in list(self.wake_events.values()) + [self.stop_event]:
+                self.loop.call_soon_threadsafe(event.set)
+        except RuntimeError:
+            pass
+        self.thread.join()
+        self.thread = None
+
 class GifWidget:
     def __init__(self):
         self.config_file = os.path.expanduser("~/.gif_widget_config.json")
@@ -23,18 +1075,35 @@ class GifWidget:
         self.root.configure(bg='black')
         
         # GIF variables
-        self.gif_frames = []
-        self.current_frame = 0
-        self.is_playing = True
+        self.gif_frames = []  # Presenter frame handles
+        self.renderer_name = 'label'  # label, atlas or delta
+        self.renderer_titles = {
+            'label': "Label (one image per frame)",
+            'atlas': "Sprite Atlas",
+            'delta': "Dirty Rectangles"
+        }
+        self.presenter = None
+        self.clock = None
+        self.frame_source = FrameSource()
+        self.thumbnail_index = None  # Loaded when the picker first opens
+        self.gallery_dir = None
+        self.label = None  # Display widget (Label or Canvas, depending on renderer)
         self.gif_path = None
         self.animation_speed = 100
         
         # Position variables
-        self.start_x = 0
-        self.start_y = 0
         self.default_x = None
         self.default_y = None
         
+        # Drag/resize state, pointer motion is merged into one geometry update per frame
+        self.geometry_interval = 16  # ms, about one display frame
+        self.pending_geometry = None  # (x, y, size or None) waiting to be applied
+        self.geometry_job = None
+        self.drag_offset = (0, 0)  # Pointer offset inside the window
+        self.resize_start = None  # (x_root, y_root, width, height) at button press
+        self.screen_size = (0, 0)
+        self.pointer_moved = False
+        
         # Resize mode variables
         self.resize_mode = False
         self.min_size = 50
@@ -69,7 +1138,6 @@ class GifWidget:
         # Wallpaper sync configuration
         self.wallpaper_sync_enabled = False
         self.last_wallpaper_analysis_pos = None
-        self.wallpaper_analysis_thread = None
         self.wallpaper_update_interval = 2.0  # seconds
         self.wallpaper_dominant_color = "#000000"
         
@@ -77,94 +1145,219 @@ class GifWidget:
         self.widget_width = 150
         self.widget_height = 150
         
-        # Create label
-        self.label = tk.Label(self.root, bg='black', bd=0, highlightthickness=0)
-        self.label.pack()
-        
-        # Event bindings
-        self.label.bind('<Button-1>', self.start_drag)
-        self.label.bind('<B1-Motion>', self.on_drag)
-        self.label.bind('<Double-Button-1>', self.reset_position)
-        self.label.bind('<Button-3>', self.show_menu)  # Right click menu
-        self.label.bind('<Control-Button-1>', self.start_resize)  # Ctrl + Left click for resizing
-        self.label.bind('<Control-B1-Motion>', self.on_resize)  # Ctrl + Drag for resizing
-        
         # Add click handler to main window (to close menu)
         self.root.bind('<Button-1>', self.close_menu_if_open)
+        self.root.protocol('WM_DELETE_WINDOW', self.shutdown)
+        
+        # Background probes share one service loop, results come back through a queue
+        self.window_position = (0, 0)  # Last known position, readable from the service thread
+        self.closed = False  # Set by shutdown()
+        self.saved_config_signature = None  # Config file as last written by save_config()
+        self.service = BackgroundService()
+        self.service.add_probe('desktop', self.probe_desktop_status, 0.5)
+        self.service.add_probe('wallpaper', self.probe_wallpaper_color, self.wallpaper_update_interval)
+        self.service_handlers = {
+            'desktop': self.toggle_visibility,
+            'wallpaper': self.apply_wallpaper_color,
+            'config_file': self.on_config_file_changed,
+            'gif_file': lambda signature: self.reload_gif_in_background(),
+            'gif_decoded': self.swap_decoded_gif
+        }
         
         # Load configuration
         self.load_config()
         
+        # Create display widget for the selected renderer
+        self.create_display()
+        
         # Apply initial border
         self.apply_border()
         
-        # Desktop check thread - RE-ENABLED
-        self.desktop_check_thread = threading.Thread(target=self.check_desktop_status, daemon=True)
-        self.desktop_check_thread.start()
-        
         # If no gif exists, ask to select one
         if not self.gif_path or not os.path.exists(self.gif_path):
             self.select_gif()
+            # Picker cancelled on first run, don't start anything
+            if self.closed:
+                return
         else:
             self.load_gif()
         
         # Set default position
         self.set_default_position()
         
-        # Start wallpaper sync if enabled
-        if self.wallpaper_sync_enabled:
-            self.start_wallpaper_sync_thread()
+        # Start background probes (desktop status, wallpaper sync), file watches and the Tk-side pump
+        self.service.watch('config_file', self.config_file)
+        self.service.watch('gif_file', self.gif_path)
+        self.service.start()
+        self.pump_service_results()
         
-    def load_config(self):
-        """Load settings from configuration file"""
+    def read_config(self):
+        """Read the configuration file, returning {} if missing or invalid"""
         try:
             if os.path.exists(self.config_file):
                 with open(self.config_file, 'r') as f:
-                    config = json.load(f)
-                    self.gif_path = config.get('gif_path')
-                    self.default_x = config.get('default_x')
-                    self.default_y = config.get('default_y')
-                    self.widget_width = config.get('width', 150)
-                    self.widget_height = config.get('height', 150)
-                    self.animation_speed = config.get('speed', 100)
-                    self.hide_when_not_desktop = config.get('hide_when_not_desktop', True)
-                    # Load border settings
-                    self.border_enabled = config.get('border_enabled', False)
-                    self.border_style = config.get('border_style', 'solid')
-                    self.border_color = config.get('border_color', '#FF0000')
-                    self.border_width = config.get('border_width', 3)
-                    self.current_border_name = config.get('current_border_name', 'None')
-                    # Load wallpaper sync settings
-                    self.wallpaper_sync_enabled = config.get('wallpaper_sync_enabled', False)
-                    self.wallpaper_dominant_color = config.get('wallpaper_dominant_color', '#000000')
+                    return json.load(f)
         except Exception as e:
             print(f"Config loading error: {e}")
+        return {}
+    
+    def load_config(self):
+        """Load settings from configuration file"""
+        config = self.read_config()
+        for key, attribute, default in self.config_fields:
+            value = default
+            if key in config:
+                try:
+                    value = self.clean_config_value(key, config[key])
+                except (TypeError, ValueError) as e:
+                    print(f"Invalid config value for {key}, using default: {e}")
+            setattr(self, attribute, value)
+    
+    def clean_config_value(self, key, value):
+        """Check and convert a config value, raising ValueError/TypeError if unusable"""
+        if key in ('width', 'height'):
+            return max(self.min_size, min(self.max_size, int(value)))
+        if key == 'speed':
+            value = int(value)
+            if value < 1:
+                raise ValueError(f"speed must be at least 1, got {value}")
+            return value
+        if key == 'border_width':
+            value = int(value)
+            if value < 0:
+                raise ValueError(f"border_width must not be negative, got {value}")
+            return value
+        if key in ('default_x', 'default_y'):
+            return None if value is None else int(value)
+        if key in ('gif_path', 'gallery_dir'):
+            if value is not None and not isinstance(value, str):
+                raise TypeError(f"expected a path, got {value!r}")
+            return value
+        if key == 'renderer' and value not in PRESENTERS:
+            raise ValueError(f"unknown renderer {value!r}")
+        
+        # Remaining fields keep the type of their default
+        default = next(default for field, _, default in self.config_fields if field == key)
+        if not isinstance(value, type(default)):
+            raise TypeError(f"expected {type(default).__name__}, got {value!r}")
+        return value
     
     def save_config(self):
         """Save configuration to file"""
         try:
-            config = {
-                'gif_path': self.gif_path,
-                'default_x': self.default_x,
-                'default_y': self.default_y,
-                'width': self.widget_width,
-                'height': self.widget_height,
-                'speed': self.animation_speed,
-                'hide_when_not_desktop': self.hide_when_not_desktop,
-                # Save border settings
-                'border_enabled': self.border_enabled,
-                'border_style': self.border_style,
-                'border_color': self.border_color,
-                'border_width': self.border_width,
-                'current_border_name': self.current_border_name,
-                # Save wallpaper sync settings
-                'wallpaper_sync_enabled': self.wallpaper_sync_enabled,
-                'wallpaper_dominant_color': self.wallpaper_dominant_color
-            }
+            config = {key: getattr(self, attribute) for key, attribute, _ in self.config_fields}
             with open(self.config_file, 'w') as f:
                 json.dump(config, f)
         except Exception as e:
             print(f"Config saving error: {e}")
+        # Our own write must not be reloaded over state changed since
+        self.saved_config_signature = file_signature(self.config_file)
+    
+    def on_config_file_changed(self, signature):
+        """Reload the configuration unless the change is our own save_config()"""
+        if signature == self.saved_config_signature:
+            return
+        self.reload_config()
+    
+    def reload_config(self):
+        """Apply only the settings that changed in the configuration file"""
+        config = self.read_config()
+        changed = set()
+        for key, attribute, _ in self.config_fields:
+            if key not in config:
+                continue
+            try:
+                value = self.clean_config_value(key, config[key])
+            except (TypeError, ValueError) as e:
+                # Keep the running value
+                print(f"Ignoring invalid config value for {key}: {e}")
+                continue
+            if value != getattr(self, attribute):
+                setattr(self, attribute, value)
+                changed.add(key)
+        
+        # Position is always recalculated, nothing else to do for these
+        changed -= {'default_x', 'default_y', 'gallery_dir', 'wallpaper_dominant_color'}
+        if not changed:
+            return
+        print(f"Config changed on disk: {', '.join(sorted(changed))}")
+        
+        if 'speed' in changed:
+            self.clock.frame_delay = self.animation_speed
+        
+        if 'hide_when_not_desktop' in changed and not self.hide_when_not_desktop:
+            self.root.deiconify()
+            self.root.attributes('-topmost', True)
+            self.service.forget('desktop')
+        
+        if changed & {'width', 'height'}:
+            self.set_default_position()
+        
+        if 'gif_path' in changed:
+            self.service.watch('gif_file', self.gif_path)
+        
+        if 'renderer' in changed:
+            self.rebuild_display()
+        else:
+            if changed & {'border_enabled', 'border_style', 'border_color',
+                          'border_width', 'current_border_name'}:
+                self.apply_border()
+            if changed & {'gif_path', 'width', 'height'}:
+                self.reload_gif_in_background()
+        
+        if 'wallpaper_sync_enabled' in changed:
+            if self.wallpaper_sync_enabled:
+                self.last_wallpaper_analysis_pos = None
+                self.update_wallpaper_sync_border()
+            elif self.current_border_name == "Wallpaper Sync":
+                self.remove_wallpaper_sync_border()
+                self.save_config()
+    
+    # Config file key, attribute, default
+    config_fields = [
+        ('gif_path', 'gif_path', None),
+        ('default_x', 'default_x', None),
+        ('default_y', 'default_y', None),
+        ('width', 'widget_width', 150),
+        ('height', 'widget_height', 150),
+        ('speed', 'animation_speed', 100),
+        ('renderer', 'renderer_name', 'label'),
+        ('gallery_dir', 'gallery_dir', None),
+        ('hide_when_not_desktop', 'hide_when_not_desktop', True),
+        # Border settings
+        ('border_enabled', 'border_enabled', False),
+        ('border_style', 'border_style', 'solid'),
+        ('border_color', 'border_color', '#FF0000'),
+        ('border_width', 'border_width', 3),
+        ('current_border_name', 'current_border_name', 'None'),
+        # Wallpaper sync settings
+        ('wallpaper_sync_enabled', 'wallpaper_sync_enabled', False),
+        ('wallpaper_dominant_color', 'wallpaper_dominant_color', '#000000')
+    ]
+    
+    def create_display(self):
+        """Create the frame display widget for the selected renderer"""
+        if self.label is not None:
+            self.label.destroy()
+        
+        presenter_class = PRESENTERS.get(self.renderer_name, LabelPresenter)
+        self.presenter = presenter_class()
+        self.label = self.presenter.create_widget(self.root)
+        self.label.pack()
+        
+        # Playback is driven by Tk's own after() scheduler
+        if self.clock is not None:
+            self.clock.stop()
+        self.clock = PlaybackClock(self.root, self.presenter, self.animation_speed)
+        
+        # Event bindings
+        self.label.bind('<Button-1>', self.start_drag)
+        self.label.bind('<B1-Motion>', self.on_drag)
+        self.label.bind('<ButtonRelease-1>', self.end_drag)
+        self.label.bind('<Double-Button-1>', self.reset_position)
+        self.label.bind('<Button-3>', self.show_menu)  # Right click menu
+        self.label.bind('<Control-Button-1>', self.start_resize)  # Ctrl + Left click for resizing
+        self.label.bind('<Control-B1-Motion>', self.on_resize)  # Ctrl + Drag for resizing
     
     def set_default_position(self):
         """Set default position to bottom right corner of screen"""
@@ -179,36 +1372,44 @@ class GifWidget:
         self.default_y = screen_height - self.widget_height - panel_height - 10  # Panel height + 10 pixels from bottom edge
         
         self.root.geometry(f"{self.widget_width}x{self.widget_height}+{self.default_x}+{self.default_y}")
+        self.window_position = (self.default_x, self.default_y)
     
     def select_gif(self):
         """GIF file selection"""
         # Stop current animation
-        was_playing = self.is_playing
-        self.is_playing = False
+        was_playing = self.clock.is_playing
+        self.clock.stop()
         
         self.root.withdraw()  # Hide main window
         
-        file_path = filedialog.askopenfilename(
-            title="Select GIF file",
-            filetypes=[("GIF files", "*.gif"), ("All files", "*.*")]
-        )
+        # Thumbnail picker, starting in the last used folder
+        if self.thumbnail_index is None:
+            self.thumbnail_index = ThumbnailIndex()
+        directory = self.gallery_dir
+        if not directory or not os.path.isdir(directory):
+            directory = os.path.dirname(self.gif_path) if self.gif_path else os.path.expanduser("~")
+        gallery = GifGallery(self.root, directory, self.thumbnail_index)
+        file_path = gallery.show()
+        self.gallery_dir = gallery.directory
         
         if file_path:
             self.gif_path = file_path
+            self.service.watch('gif_file', self.gif_path)
             self.load_gif()
             self.save_config()
         else:
             # If no gif is selected and there are no existing gifs, close the app
             if not self.gif_frames:
-                self.root.quit()
+                self.shutdown()
                 return
             else:
                 # Continue old animation
-                self.is_playing = was_playing
-                if self.is_playing:
-                    self.animate_gif()
+                if was_playing:
+                    self.clock.start()
             
         self.root.deiconify()  # Show main window again
+        # Visibility changed behind the desktop probe's back
+        self.service.forget('desktop')
     
     def load_gif(self):
         """Load GIF and split into frames"""
@@ -216,102 +1417,113 @@ class GifWidget:
             if not self.gif_path or not os.path.exists(self.gif_path):
                 return
             
-            # Stop animation and clear frames
-            self.is_playing = False
-            old_frames = self.gif_frames
-            self.gif_frames = []
-            self.current_frame = 0
-            
-            gif = Image.open(self.gif_path)
-            new_frames = []
-            
-            # Determine resampling method based on PIL version
-            try:
-                # For new PIL versions
-                resample_method = Image.Resampling.LANCZOS
-            except AttributeError:
-                try:
-                    # For old PIL versions
-                    resample_method = Image.LANCZOS
-                except AttributeError:
-                    # For very old versions
-                    resample_method = 1  # LANCZOS numeric value
+            # Stop animation
+            self.clock.stop()
             
-            try:
-                frame_count = 0
-                while True:
-                    # Resize frame
-                    frame = gif.copy()
-                    frame = frame.resize((self.widget_width, self.widget_height), resample_method)
-                    photo = ImageTk.PhotoImage(frame)
-                    new_frames.append(photo)
-                    frame_count += 1
-                    gif.seek(frame_count)
-            except EOFError:
-                pass
+            # Decode/scale (cached) and hand the frames to the presenter
+            scaled_frames = self.frame_source.frames(self.gif_path, (self.widget_width, self.widget_height),
+                                                     delta=self.presenter.wants_deltas)
+            new_frames = self.presenter.load(scaled_frames)
             
             # Safely assign new frames
             if new_frames:
                 self.gif_frames = new_frames
-                self.is_playing = True
-                self.animate_gif()
+                self.clock.set_frames(new_frames)
             else:
-                # Restore old frames
-                self.gif_frames = old_frames
                 print("Could not load GIF file, keeping old GIF!")
+            self.clock.start()
                 
         except Exception as e:
             print(f"GIF loading error: {e}")
-            # Keep old frames in case of error
-            if not hasattr(self, 'gif_frames') or not self.gif_frames:
-                self.gif_frames = []
+            # Keep old frames playing in case of error
+            self.clock.start()
     
-    def animate_gif(self):
-        """Run GIF animation"""
-        if self.gif_frames and self.is_playing and len(self.gif_frames) > 0:
-            # Make sure frame index is valid
-            if self.current_frame >= len(self.gif_frames):
-                self.current_frame = 0
-            
-            try:
-                self.label.config(image=self.gif_frames[self.current_frame])
-                self.current_frame = (self.current_frame + 1) % len(self.gif_frames)
-            except (IndexError, tk.TclError) as e:
-                # In case of index error or TCL error, go to beginning
-                print(f"Animation error: {e}")
-                self.current_frame = 0
-                if len(self.gif_frames) > 0:
-                    try:
-                        self.label.config(image=self.gif_frames[0])
-                    except:
-                        # If still error, stop animation
-                        self.is_playing = False
-                        return
-            
-            self.root.after(self.animation_speed, self.animate_gif)
+    def reload_gif_in_background(self):
+        """Re-decode the current GIF off the Tk thread, swapping it in when ready"""
+        if not self.gif_path or not os.path.exists(self.gif_path):
+            return
+        path, size, presenter = self.gif_path, (self.widget_width, self.widget_height), self.presenter
+        # Decoding and delta rectangles are both computed on the service pool
+        self.service.submit('gif_decoded', lambda: (
+            path, size, presenter, self.frame_source.frames(path, size, delta=presenter.wants_deltas)
+        ))
+    
+    def swap_decoded_gif(self, result):
+        """Swap in frames decoded in the background on the next frame boundary"""
+        path, size, presenter, frames = result
+        # Drop results for a GIF, size or renderer that is no longer current
+        if (path != self.gif_path or size != (self.widget_width, self.widget_height)
+                or presenter is not self.presenter):
+            return
+        
+        new_frames = self.presenter.load(frames)
+        if new_frames:
+            self.gif_frames = new_frames
+            self.clock.queue_frames(new_frames)
     
     def start_drag(self, event):
         """Start dragging"""
-        self.start_x = event.x
-        self.start_y = event.y
+        # Query the window position once per press, motion works from the pointer alone
+        x, y = self.root.winfo_x(), self.root.winfo_y()
+        self.window_position = (x, y)
+        self.drag_offset = (event.x_root - x, event.y_root - y)
+        self.pointer_moved = False
     
     def on_drag(self, event):
         """During dragging"""
-        x = self.root.winfo_x() + event.x - self.start_x
-        y = self.root.winfo_y() + event.y - self.start_y
-        self.root.geometry(f"+{x}+{y}")
+        x = event.x_root - self.drag_offset[0]
+        y = event.y_root - self.drag_offset[1]
+        self.queue_geometry(x, y)
+    
+    def queue_geometry(self, x, y, size=None):
+        """Store a geometry change, applied at most once per display frame"""
+        self.pending_geometry = (x, y, size)
+        self.pointer_moved = True
+        if self.geometry_job is None:
+            self.geometry_job = self.root.after(self.geometry_interval, self.flush_geometry)
+    
+    def flush_geometry(self):
+        """Apply the latest pending geometry change"""
+        self.geometry_job = None
+        if self.pending_geometry is None:
+            return
         
-        # If wallpaper sync is enabled, trigger immediate analysis when dragging
-        if self.wallpaper_sync_enabled:
-            self.root.after(100, self.update_wallpaper_sync_border)
+        x, y, size = self.pending_geometry
+        self.pending_geometry = None
+        if size:
+            self.root.geometry(f"{size[0]}x{size[1]}+{x}+{y}")
+        else:
+            self.root.geometry(f"+{x}+{y}")
+        self.window_position = (x, y)
+    
+    def end_drag(self, event):
+        """Finish dragging/resizing and run the expensive follow-ups once"""
+        if self.geometry_job is not None:
+            self.root.after_cancel(self.geometry_job)
+        self.flush_geometry()
+        
+        moved, resized = self.pointer_moved, self.resize_start is not None
+        self.pointer_moved = False
+        self.resize_start = None
+        if not moved:
+            return
+        
+        # Save new size after a resize drag
+        if resized:
+            self.save_config()
+        
+        # Re-analyze wallpaper at the final position
+        self.update_wallpaper_sync_border()
     
     def reset_position(self, event):
         """Double-click to return to default position"""
         self.root.geometry(f"{self.widget_width}x{self.widget_height}+{self.default_x}+{self.default_y}")
+        self.window_position = (self.default_x, self.default_y)
     
     def reset_position_menu(self):
         """Return to default position from menu"""
         self.root.geometry(f"{self.widget_width}x{self.widget_height}+{self.default_x}+{self.default_y}")
+        self.window_position = (self.default_x, self.default_y)
     
     def show_menu(self, event):
         """Show right-click menu"""
@@ -333,6 +1545,13 @@ class GifWidget:
         hide_text = "✓ Hide when not on desktop" if self.hide_when_not_desktop else "Hide when not on desktop"
         menu.add_command(label=hide_text, command=self.toggle_hide_mode)
         
+        # Renderer submenu
+        renderer_menu = tk.Menu(menu, tearoff=0)
+        for name, title in self.renderer_titles.items():
+            display_name = f"✓ {title}" if name == self.renderer_name else title
+            renderer_menu.add_command(label=display_name, command=lambda name=name: self.set_renderer(name))
+        menu.add_cascade(label="Renderer", menu=renderer_menu)
+        
         menu.add_separator()
         
         # Border/Frame submenu
@@ -355,7 +1574,7 @@ class GifWidget:
         menu.add_separator()
         menu.add_command(label="Reset Position", command=self.reset_position_menu)
         menu.add_separator()
-        menu.add_command(label="Exit", command=self.root.quit)
+        menu.add_command(label="Exit", command=self.shutdown)
         
         # Menü kapandığında callback
         def on_menu_close():
@@ -371,9 +1590,10 @@ class GifWidget:
     
     def toggle_animation(self):
         """Stop/start animation"""
-        self.is_playing = not self.is_playing
-        if self.is_playing:
-            self.animate_gif()
+        if self.clock.is_playing:
+            self.clock.stop()
+        else:
+            self.clock.start()
     
     def toggle_resize_mode(self):
         """Toggle resize mode on/off"""
@@ -406,6 +1626,21 @@ class GifWidget:
             if not self.root.winfo_viewable():
                 self.root.deiconify()
                 self.root.attributes('-topmost', True)
+                self.service.forget('desktop')
+    
+    def set_renderer(self, name):
+        """Switch to another renderer"""
+        if name in PRESENTERS and name != self.renderer_name:
+            self.renderer_name = name
+            self.rebuild_display()
+            self.save_config()
+    
+    def rebuild_display(self):
+        """Rebuild display widget and frames for the selected renderer"""
+        self.gif_frames = []
+        self.create_display()
+        self.apply_border()
+        self.load_gif()
     
     def close_menu_if_open(self, event):
         """Close menu if open"""
@@ -429,100 +1664,90 @@ class GifWidget:
     def start_resize(self, event):
         """Start resizing"""
         if self.resize_mode:
-            self.start_x = event.x
-            self.start_y = event.y
+            self.resize_start = (event.x_root, event.y_root, self.widget_width, self.widget_height)
+            self.screen_size = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+            self.pointer_moved = False
     
     def on_resize(self, event):
         """During resizing"""
-        if self.resize_mode:
-            # Calculate distance mouse moved
-            delta_x = event.x - self.start_x
-            delta_y = event.y - self.start_y
+        if self.resize_mode and self.resize_start is not None:
+            start_x, start_y, start_width, start_height = self.resize_start
             
-            # Take average change (for both x and y)
-            delta = (delta_x + delta_y) // 2
+            # Take average distance mouse moved since the press (for both x and y)
+            delta = ((event.x_root - start_x) + (event.y_root - start_y)) // 2
             
             # Calculate new size
-            new_width = max(self.min_size, min(self.max_size, self.widget_width + delta))
-            new_height = max(self.min_size, min(self.max_size, self.widget_height + delta))
+            new_width = max(self.min_size, min(self.max_size, start_width + delta))
+            new_height = max(self.min_size, min(self.max_size, start_height + delta))
             
             # Only process if size actually changed
             if new_width != self.widget_width or new_height != self.widget_height:
-                # Save old size
-                old_width = self.widget_width
-                old_height = self.widget_height
-                
                 # Update size
                 self.widget_width = new_width
                 self.widget_height = new_height
                 
-                # Adjust position to stay fixed in bottom right corner
-                screen_width = self.root.winfo_screenwidth()
-                screen_height = self.root.winfo_screenheight()
-                panel_height = 48
-                
                 # Calculate new position (bottom right corner fixed)
+                screen_width, screen_height = self.screen_size
+                panel_height = 48
                 new_x = screen_width - self.widget_width - 10
                 new_y = screen_height - self.widget_height - panel_height - 10
                 
-                # Update window size and position
-                self.root.geometry(f"{self.widget_width}x{self.widget_height}+{new_x}+{new_y}")
-                
                 # Update default position
                 self.default_x = new_x
                 self.default_y = new_y
                 
-                # Update start point
-                self.start_x = event.x
-                self.start_y = event.y
+                # Window size and position are applied on the next frame
+                self.queue_geometry(new_x, new_y, (self.widget_width, self.widget_height))
     
-    def check_desktop_status(self):
-        """Check desktop status"""
-        while True:
-            try:
-                # Skip check if menu is open
-                if self.menu_open:
-                    time.sleep(0.5)
-                    continue
-                
-                # Skip check if hide mode is disabled
-                if not self.hide_when_not_desktop:
-                    time.sleep(0.5)
-                    continue
-                
-                # Check active window
-                result = subprocess.run(['xdotool', 'getactivewindow', 'getwindowname'], 
-                                      capture_output=True, text=True)
-                
-                # Check if on desktop
-                is_on_desktop = False
-                
-                if result.returncode != 0:
-                    # If no active window, we're on desktop
-                    is_on_desktop = True
-                else:
-                    window_name = result.stdout.strip().lower()
-                    # Desktop window names
-                    desktop_windows = ['desktop', 'masaüstü', 'nautilus-desktop', 'gnome-shell']
-                    
-                    # Empty name or desktop window names
-                    is_on_desktop = (window_name == '' or 
-                                   any(desktop_word in window_name for desktop_word in desktop_windows))
-                
-                # Show/hide widget
-                self.root.after(0, self.toggle_visibility, is_on_desktop)
-                
-            except Exception as e:
-                # Silent error handling to avoid spam
-                pass
-            
-            time.sleep(0.5)  # Check every 0.5 seconds
+    def probe_desktop_status(self):
+        """Check desktop status (runs on the service loop)"""
+        # Skip check if menu is open or hide mode is disabled
+        if self.menu_open or not self.hide_when_not_desktop:
+            return None
+        
+        try:
+            # Check active window
+            result = subprocess.run(['xdotool', 'getactivewindow', 'getwindowname'], 
+                                  capture_output=True, text=True, timeout=2)
+        except (OSError, subprocess.TimeoutExpired):
+            # Silent error handling to avoid spam
+            return None
+        
+        if result.returncode != 0:
+            # If no active window, we're on desktop
+            return True
+        
+        window_name = result.stdout.strip().lower()
+        # Desktop window names
+        desktop_windows = ['desktop', 'masaüstü', 'nautilus-desktop', 'gnome-shell']
+        
+        # Empty name or desktop window names
+        return (window_name == '' or 
+                any(desktop_word in window_name for desktop_word in desktop_windows))
+    
+    def pump_service_results(self):
+        """Deliver queued background results on the Tk thread"""
+        for name, value in self.service.drain():
+            handler = self.service_handlers.get(name)
+            if handler:
+                # One failing handler must not stop the pump
+                try:
+                    handler(value)
+                except Exception as e:
+                    print(f"Background result error ({name}): {e}")
+        
+        try:
+            self.root.after(100, self.pump_service_results)
+        except tk.TclError:
+            # Window destroyed
+            pass
     
     def toggle_visibility(self, show):
         """Toggle widget visibility"""
         try:
-            # Don't hide widget if menu is open
+            # Don't hide widget if menu is open, but get this state again afterwards
             if self.menu_open:
+                self.service.forget('desktop')
                 return
                 
             # If hide when not on desktop is disabled, always show
@@ -530,6 +1755,7 @@ class GifWidget:
                 if not self.root.winfo_viewable():
                     self.root.deiconify()
                     self.root.attributes('-topmost', True)
+                self.service.forget('desktop')
                 return
                 
             if show:
@@ -547,6 +1773,7 @@ class GifWidget:
                 self.root.attributes('-topmost', True)
             except:
                 pass
+            self.service.forget('desktop')
     
     def apply_border(self):
         """Apply the current border style to the widget"""
@@ -676,7 +1903,7 @@ class GifWidget:
             screenshot = ImageGrab.grab(bbox)
             
             # Resize for faster processing
-            screenshot = screenshot.resize((50, 50), Image.Resampling.LANCZOS if hasattr(Image, 'Resampling') else Image.LANCZOS)
+            screenshot = scaled_resize(screenshot, (50, 50))
             
             # Get pixel colors
             pixels = list(screenshot.getdata())
@@ -740,9 +1967,8 @@ class GifWidget:
     def analyze_wallpaper_at_position(self):
         """Analyze wallpaper color at current widget position"""
         try:
-            # Get current widget position
-            widget_x = self.root.winfo_x()
-            widget_y = self.root.winfo_y()
+            # Get current widget position (snapshot kept by the Tk thread)
+            widget_x, widget_y = self.window_position
             
             # Analyze area around the widget (slightly larger area for better sampling)
             sample_width = self.widget_width + 40
@@ -762,81 +1988,220 @@ class GifWidget:
             print(f"Wallpaper analysis error: {e}")
             return "#000000"
     
-    def update_wallpaper_sync_border(self):
-        """Update border color based on wallpaper analysis"""
+    def probe_wallpaper_color(self):
+        """Analyze wallpaper color if the widget moved (runs on the service loop)"""
+        if not self.wallpaper_sync_enabled:
+            return None
+        
+        current_pos = self.window_position
+        
+        # Only analyze if position changed significantly or first time
+        if (self.last_wallpaper_analysis_pos is not None and 
+            abs(current_pos[0] - self.last_wallpaper_analysis_pos[0]) <= 20 and
+            abs(current_pos[1] - self.last_wallpaper_analysis_pos[1]) <= 20):
+            return None
+        
+        new_color = self.analyze_wallpaper_at_position()
+        self.last_wallpaper_analysis_pos = current_pos
+        return new_color
+    
+    def apply_wallpaper_color(self, new_color):
+        """Apply analyzed wallpaper color as border"""
         if not self.wallpaper_sync_enabled:
             return
             
         try:
-            # Get current position
-            current_pos = (self.root.winfo_x(), self.root.winfo_y())
-            
-            # Only analyze if position changed significantly or first time
-            if (self.last_wallpaper_analysis_pos is None or 
-                abs(current_pos[0] - self.last_wallpaper_analysis_pos[0]) > 20 or
-                abs(current_pos[1] - self.last_wallpaper_analysis_pos[1]) > 20):
+            if new_color != self.wallpaper_dominant_color:
+                self.wallpaper_dominant_color = new_color
                 
-                # Analyze wallpaper color
-                new_color = self.analyze_wallpaper_at_position()
+                # Apply the new color as border
+                self.border_enabled = True
+                self.border_style = "solid"
+                self.border_color = new_color
+                self.border_width = 3
+                self.current_border_name = "Wallpaper Sync"
                 
-                if new_color != self.wallpaper_dominant_color:
-                    self.wallpaper_dominant_color = new_color
-                    
-                    # Apply the new color as border
-                    self.border_enabled = True
-                    self.border_style = "solid"
-                    self.border_color = new_color
-                    self.border_width = 3
-                    self.current_border_name = "Wallpaper Sync"
-                    
-                    self.apply_border()
-                    self.save_config()
-                
-                self.last_wallpaper_analysis_pos = current_pos
+                self.apply_border()
+                self.save_config()
                 
         except Exception as e:
             print(f"Wallpaper sync update error: {e}")
     
-    def start_wallpaper_sync_thread(self):
-        """Start wallpaper sync monitoring thread"""
-        if self.wallpaper_analysis_thread and self.wallpaper_analysis_thread.is_alive():
-            return
-            
-        def wallpaper_sync_loop():
-            while self.wallpaper_sync_enabled:
-                try:
-                    self.root.after(0, self.update_wallpaper_sync_border)
-                    time.sleep(self.wallpaper_update_interval)
-                except Exception as e:
-                    print(f"Wallpaper sync thread error: {e}")
-                    time.sleep(1)
-        
-        self.wallpaper_analysis_thread = threading.Thread(target=wallpaper_sync_loop, daemon=True)
-        self.wallpaper_analysis_thread.start()
+    def update_wallpaper_sync_border(self):
+        """Request an immediate wallpaper analysis"""
+        if self.wallpaper_sync_enabled:
+            self.service.trigger('wallpaper')
     
     def toggle_wallpaper_sync(self):
         """Toggle wallpaper sync mode on/off"""
         self.wallpaper_sync_enabled = not self.wallpaper_sync_enabled
         
         if self.wallpaper_sync_enabled:
-            # Start wallpaper sync
-            self.start_wallpaper_sync_thread()
-            # Immediate analysis
+            # Immediate analysis at the current position
+            self.last_wallpaper_analysis_pos = None
             self.update_wallpaper_sync_border()
-        else:
+        elif self.current_border_name == "Wallpaper Sync":
             # Return to previous border style
-            if self.current_border_name == "Wallpaper Sync":
-                self.current_border_name = "None"
-                self.border_enabled = False
-                self.apply_border()
+            self.remove_wallpaper_sync_border()
         
         self.save_config()
+    
+    def remove_wallpaper_sync_border(self):
+        """Drop the border wallpaper sync put in place"""
+        self.current_border_name = "None"
+        self.border_enabled = False
+        self.apply_border()
+
+    def shutdown(self):
+        """Stop background work and leave the main loop"""
+        self.closed = True
+        self.service.stop()
+        self.root.quit()
 
     def run(self):
         """Run the widget"""
-        self.root.mainloop()
+        # Already shut down during startup (mainloop would ignore the earlier quit)
+        if self.closed:
+            self.root.destroy()
+            return
+        try:
+            self.root.mainloop()
+        finally:
+            self.service.stop()
+
+def benchmark_resize(gif_path, sizes=((150, 150), (300, 300), (500, 500)), max_difference=1.0):
+    """Time scaled_resize against a plain LANCZOS resize and check the visual difference"""
+    frames = []
+    with Image.open(gif_path) as gif:
+        try:
+            while True:
+                frames.append(gif.convert('RGBA'))
+                gif.seek(len(frames))
+        except EOFError:
+            pass
+    
+    resample = get_quality_filter()
+    passed = True
+    for size in sizes:
+        start = time.perf_counter()
+        reference = [frame.resize(size, resample) for frame in frames]
+        plain_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        scaled = [scaled_resize(frame, size) for frame in frames]
+        scaled_time = time.perf_counter() - start
+        
+        # Worst per-frame mean absolute difference, in 0-255 units
+        worst = 0.0
+        for expected, actual in zip(reference, scaled):
+            channel_means = ImageStat.Stat(ImageChops.difference(expected, actual)).mean
+            worst = max(worst, sum(channel_means) / len(channel_means))
+        
+        ok = worst <= max_difference
+        passed = passed and ok
+        print(f"{size[0]}x{size[1]}: plain {plain_time * 1000:.0f} ms, scaled {scaled_time * 1000:.0f} ms "
+              f"({plain_time / scaled_time:.1f}x), worst mean diff {worst:.2f}/255 "
+              f"{'ok' if ok else 'FAIL'}")
+    return passed
+
+def benchmark_renderers(gif_path, size=(150, 150), ticks=2000):
+    """Compare frame packing, first display, per-tick cost and Tk image count of each renderer"""
+    # Decoding is shared by every renderer, so it is timed once and kept out of the comparison
+    start = time.perf_counter()
+    with Image.open(gif_path) as gif:
+        frames = list(iter_gif_frames(gif, size))
+    decode_time = time.perf_counter() - start
+    print(f"decode: {len(frames)} frames in {decode_time * 1000:.0f} ms")
+    
+    root = tk.Tk()
+    root.overrideredirect(True)
+    root.geometry(f"{size[0]}x{size[1]}+0+0")
+    
+    results = {}
+    for name, presenter_class in PRESENTERS.items():
+        presenter = presenter_class()
+        widget = presenter.create_widget(root)
+        widget.pack()
+        # Map the widget first so its first display is not charged to the renderer
+        root.update()
+        
+        # Off-Tk work FrameSource does for this renderer (delta rectangles)
+        start = time.perf_counter()
+        prepared = DeltaFrames(frames) if presenter.wants_deltas else frames
+        prepare_time = time.perf_counter() - start
+        
+        # Tk image creation on the Tk thread
+        start = time.perf_counter()
+        handles = presenter.load(prepared)
+        pack_time = time.perf_counter() - start
+        image_count = len(root.tk.call('image', 'names'))
+        
+        start = time.perf_counter()
+        presenter.show(handles[0])
+        root.update()
+        first_time = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        for tick in range(1, ticks + 1):
+            presenter.show(handles[tick % len(handles)])
+            root.update_idletasks()
+        tick_time = (time.perf_counter() - start) / ticks
+        results[name] = (pack_time, tick_time)
+        
+        # Relative to the original one-image-per-frame Label path
+        pack_ratio, tick_ratio = (value / reference for value, reference
+                                  in zip(results[name], results['label']))
+        print(f"{name}: {len(handles)} frames, {image_count} Tk images, "
+              f"prepare {prepare_time * 1000:.0f} ms, pack {pack_time * 1000:.0f} ms ({pack_ratio:.2f}x label), "
+              f"first display {first_time * 1000:.1f} ms, "
+              f"{tick_time * 1e6:.1f} us/tick ({tick_ratio:.2f}x label)")
+        
+        widget.destroy()
+        del handles, prepared
+    
+    root.destroy()
+
+def simulate_playback(gif_path, size=(150, 150), frame_delay=100, seconds=3600):
+    """Run the playback pipeline offscreen and check frame timing (no X server needed)"""
+    start = time.perf_counter()
+    frames = FrameSource().frames(gif_path, size)
+    decode_time = time.perf_counter() - start
+    
+    scheduler = SimulatedScheduler()
+    presenter = OffscreenPresenter(scheduler.time)
+    clock = PlaybackClock(scheduler, presenter, frame_delay)
+    clock.set_frames(presenter.load(frames))
+    
+    start = time.perf_counter()
+    clock.start()
+    scheduler.run_for(seconds * 1000)
+    run_time = time.perf_counter() - start
+    
+    # Every frame must appear exactly frame_delay ms after the previous one, in order
+    errors = 0
+    for index, (shown_at, frame) in enumerate(presenter.shown):
+        if shown_at != index * frame_delay or frame != index % len(frames):
+            errors += 1
+    
+    print(f"decode: {len(frames)} frames in {decode_time * 1000:.0f} ms")
+    print(f"playback: {len(presenter.shown)} ticks over {seconds} simulated s "
+          f"in {run_time * 1000:.0f} ms, {errors} timing errors")
+    return errors == 0
 
 if __name__ == "__main__":
+    # Renderer benchmark: python3 gif_widget.py --benchmark file.gif
+    if len(sys.argv) == 3 and sys.argv[1] == '--benchmark':
+        benchmark_renderers(sys.argv[2])
+        sys.exit(0)
+    
+    # Resize benchmark with difference check: python3 gif_widget.py --benchmark-resize file.gif
+    if len(sys.argv) == 3 and sys.argv[1] == '--benchmark-resize':
+        sys.exit(0 if benchmark_resize(sys.argv[2]) else 1)
+    
+    # Offscreen playback check: python3 gif_widget.py --simulate file.gif
+    if len(sys.argv) == 3 and sys.argv[1] == '--simulate':
+        sys.exit(0 if simulate_playback(sys.argv[2]) else 1)
+    
     # Check if xdotool is installed
     try:
         subprocess.run(['which', 'xdotool'], check=True, capture_output=True)
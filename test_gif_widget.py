@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Offscreen playback tests: python3 -m unittest test_gif_widget (no X server needed)"""
+
+import unittest
+
+from gif_widget import OffscreenPresenter, PlaybackClock, SimulatedScheduler
+
+class PlaybackClockTest(unittest.TestCase):
+    """PlaybackClock timing on a SimulatedScheduler"""
+
+    def setUp(self):
+        self.scheduler = SimulatedScheduler()
+        self.presenter = OffscreenPresenter(self.scheduler.time)
+        self.clock = PlaybackClock(self.scheduler, self.presenter, frame_delay=100)
+
+    def test_steady_looping(self):
+        """Frames loop in order, exactly frame_delay apart"""
+        self.clock.set_frames(['a', 'b', 'c'])
+        self.clock.start()
+        self.scheduler.run_for(650)
+        self.assertEqual(self.presenter.shown, [
+            (0, 'a'), (100, 'b'), (200, 'c'), (300, 'a'), (400, 'b'), (500, 'c'), (600, 'a')
+        ])
+
+    def test_queue_frames_swaps_on_frame_boundary(self):
+        """Queued frames replace the old ones at the next tick, without a gap or extra tick"""
+        self.clock.set_frames(['a', 'b', 'c'])
+        self.clock.start()
+        self.scheduler.run_for(150)
+        self.clock.queue_frames(['x', 'y'])
+        # Current frame stays on screen until its time is up
+        self.assertEqual(self.presenter.shown[-1], (100, 'b'))
+        self.scheduler.run_for(300)
+        self.assertEqual(self.presenter.shown, [
+            (0, 'a'), (100, 'b'), (200, 'x'), (300, 'y'), (400, 'x')
+        ])
+
+    def test_queue_frames_while_stopped_replaces_immediately(self):
+        """Without a running clock queued frames are set right away"""
+        self.clock.set_frames(['a', 'b'])
+        self.clock.queue_frames(['x', 'y'])
+        self.assertEqual(self.clock.frames, ['x', 'y'])
+        self.assertIsNone(self.clock.next_frames)
+
+    def test_stop_start_keeps_one_tick_chain(self):
+        """Stopping and starting again never leaves two after() chains running"""
+        self.clock.set_frames(['a', 'b', 'c'])
+        self.clock.start()
+        self.scheduler.run_for(50)
+        self.clock.stop()
+        self.clock.start()
+        self.clock.start()  # No-op while playing
+        self.scheduler.run_for(1000)
+
+        times = [shown_at for shown_at, _ in self.presenter.shown]
+        self.assertEqual(times, [0] + list(range(50, 1051, 100)))
+
+    def test_stopped_clock_shows_nothing(self):
+        """No frames are shown after stop()"""
+        self.clock.set_frames(['a', 'b'])
+        self.clock.start()
+        self.scheduler.run_for(150)
+        self.clock.stop()
+        self.assertFalse(self.clock.is_playing)
+        self.scheduler.run_for(1000)
+        self.assertEqual(self.presenter.shown, [(0, 'a'), (100, 'b')])
+
+    def test_frame_delay_change_applies_from_next_tick(self):
+        """A new frame_delay is used for the tick scheduled after the change"""
+        self.clock.set_frames(['a', 'b', 'c'])
+        self.clock.start()
+        self.scheduler.run_for(50)
+        self.clock.frame_delay = 40
+        self.scheduler.run_for(150)
+        # The tick already scheduled at 100 keeps its time, later ones use 40 ms
+        self.assertEqual(self.presenter.shown, [
+            (0, 'a'), (100, 'b'), (140, 'c'), (180, 'a')
+        ])
+
+    def test_set_frames_while_stopped(self):
+        """set_frames on a stopped clock shows nothing until start, then begins at the first frame"""
+        self.clock.set_frames(['a', 'b', 'c'])
+        self.clock.start()
+        self.scheduler.run_for(150)
+        self.clock.stop()
+        self.clock.set_frames(['x', 'y'])
+        self.scheduler.run_for(500)
+        self.assertEqual(self.presenter.shown, [(0, 'a'), (100, 'b')])
+
+        self.clock.start()
+        self.scheduler.run_for(150)
+        self.assertEqual(self.presenter.shown[2:], [(650, 'x'), (750, 'y')])
+
+    def test_start_without_frames_does_nothing(self):
+        """An empty clock never schedules a tick"""
+        self.clock.start()
+        self.assertFalse(self.clock.is_playing)
+        self.scheduler.run_for(1000)
+        self.assertEqual(self.presenter.shown, [])
+
+if __name__ == "__main__":
+    unittest.main()